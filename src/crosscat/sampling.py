@@ -25,11 +25,11 @@ from itertools import chain
 
 import numpy as np
 
+from scipy.special import logsumexp
+
 from cgpm.primitives.crp import Crp
 
-from cgpm.utils.general import log_normalize
 from cgpm.utils.general import log_pflip
-from cgpm.utils.general import logsumexp
 from cgpm.utils.general import merged
 
 from cgpm.utils.validation import partition_query_evidence
@@ -71,29 +71,26 @@ def state_simulate(state, rowid, targets, constraints=None, N=None):
 def view_logpdf(view, rowid, targets, constraints):
     if not view.hypothetical(rowid):
         return _logpdf_row(view, targets, view.Zr(rowid))
-    Nk = view.Nk()
-    N_rows = len(view.Zr())
     K = view.crp.clusters[0].gibbs_tables(-1)
-    lp_crp = [Crp.calc_predictive_logp(k, N_rows, Nk, view.alpha()) for k in K]
-    lp_constraints = [_logpdf_row(view, constraints, k) for k in K]
-    if all(np.isinf(lp_constraints)):
+    lp_crp = _logpdf_crp(view, K)
+    lp_constraints = _logpdf_row_clusters(view, constraints, K)
+    if np.all(np.isinf(lp_constraints)):
         raise ValueError('Zero density constraints: %s' % (constraints,))
-    lp_cluster = log_normalize(np.add(lp_crp, lp_constraints))
-    lp_targets = [_logpdf_row(view, targets, k) for k in K]
-    return logsumexp(np.add(lp_cluster, lp_targets))
+    lp_cluster = lp_crp + lp_constraints
+    lp_cluster -= logsumexp(lp_cluster)
+    lp_targets = _logpdf_row_clusters(view, targets, K)
+    return logsumexp(lp_cluster + lp_targets)
 
 
 def view_simulate(view, rowid, targets, constraints, N):
     if not view.hypothetical(rowid):
         return _simulate_row(view, targets, view.Zr(rowid), N)
-    Nk = view.Nk()
-    N_rows = len(view.Zr())
     K = view.crp.clusters[0].gibbs_tables(-1)
-    lp_crp = [Crp.calc_predictive_logp(k, N_rows, Nk, view.alpha()) for k in K]
-    lp_constraints = [_logpdf_row(view, constraints, k) for k in K]
-    if all(np.isinf(lp_constraints)):
+    lp_crp = _logpdf_crp(view, K)
+    lp_constraints = _logpdf_row_clusters(view, constraints, K)
+    if np.all(np.isinf(lp_constraints)):
         raise ValueError('Zero density constraints: %s' % (constraints,))
-    lp_cluster = np.add(lp_crp, lp_constraints)
+    lp_cluster = lp_crp + lp_constraints
     ks = log_pflip(lp_cluster, array=K, size=N, rng=view.rng)
     counts = {k:n for k,n in enumerate(np.bincount(ks)) if n > 0}
     samples = (_simulate_row(view, targets, k, counts[k]) for k in counts)
@@ -108,6 +105,28 @@ def _logpdf_row(view, targets, cluster):
     )
 
 
+def _logpdf_row_clusters(view, targets, K):
+    """Return joint density of the targets in each cluster of K."""
+    logps = [
+        [
+            view.dims[c].logpdf(None, {c:x}, None, {view.outputs[0]: k})
+            for k in K
+        ]
+        for c, x in targets.items()
+    ]
+    return np.sum(logps, axis=0) if logps else np.zeros(len(K))
+
+
+def _logpdf_crp(view, K):
+    """Return crp predictive density of a new row joining each table in K."""
+    Nk = view.Nk()
+    N_rows = len(view.Zr())
+    alpha = view.alpha()
+    return np.asarray([
+        Crp.calc_predictive_logp(k, N_rows, Nk, alpha) for k in K
+    ])
+
+
 def _simulate_row(view, targets, cluster, N):
     """Return sample of the targets in a fixed cluster."""
     samples = (
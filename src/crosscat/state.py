@@ -544,14 +544,11 @@ class State(CGpm):
         if self.hypothetical(rowid):
             return constraints
         # Retrieve all values for this rowid not in targets or constraints.
+        exclude = frozenset(targets).union(constraints)
         data = {
             c: self.X[c][rowid]
             for c in self.outputs[1:]
-            if not any([
-                c in targets,
-                c in constraints,
-                isnan(self.X[c][rowid]),
-            ])
+            if c not in exclude and not isnan(self.X[c][rowid])
         }
         return gu.merged(constraints, data)
 
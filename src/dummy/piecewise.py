@@ -122,7 +122,7 @@ class PieceWise(CGpm):
                     constraints,
                     inputs,
                 )
-                logp = gu.logsumexp([logp_xz0, logp_xz1])
+                logp = np.logaddexp(logp_xz0, logp_xz1)
             else:
                 raise ValueError('Invalid query pattern: %s %s %s'
                     % (targets, constraints, inputs))
@@ -155,16 +155,7 @@ class Dim(CGpm):
         self.rng.shuffle(hypers)
         # For each hyper.
         for hyper in hypers:
-            logps = []
-            # For each grid point.
-            for grid_value in self.hyper_grids[hyper]:
-                # Compute the probability of the grid point.
-                self.hypers[hyper] = grid_value
-                logp_k = 0
-                for k in self.clusters:
-                    self.clusters[k].set_hypers(self.hypers)
-                    logp_k += self.clusters[k].logpdf_score()
-                logps.append(logp_k)
+            logps = self._logpdf_score_grid(hyper)
             # Sample a new hyperparameter from the grid.
             index = gu.log_pflip(logps, rng=self.rng)
             self.hypers[hyper] = self.hyper_grids[hyper][index]
@@ -236,6 +227,25 @@ class Dim(CGpm):
             outputs=[self.index], inputs=self.inputs[1:], hypers=self.hypers,
             distargs=self.distargs, rng=self.rng)
 
+    def _logpdf_score_grid(self, hyper):
+        """Compute logpdf_score at every grid point of hyper."""
+        grid = self.hyper_grids[hyper]
+        # Models with a closed form score the whole grid in one pass.
+        if hasattr(self.model, 'calc_logpdf_score_grid'):
+            return self.model.calc_logpdf_score_grid(
+                hyper, grid, list(self.clusters.values()))
+        logps = []
+        # For each grid point.
+        for grid_value in grid:
+            # Compute the probability of the grid point.
+            self.hypers[hyper] = grid_value
+            logp_k = 0
+            for k in self.clusters:
+                self.clusters[k].set_hypers(self.hypers)
+                logp_k += self.clusters[k].logpdf_score()
+            logps.append(logp_k)
+        return logps
+
     def preprocess(self, targets, constraints, inputs):
         inputs2 = inputs.copy()
         try:
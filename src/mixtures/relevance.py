@@ -18,7 +18,8 @@
 from builtins import zip
 import numpy as np
 
-from cgpm.utils.general import logsumexp
+from scipy.special import logsumexp
+
 from cgpm.utils.config import check_env_debug
 
 
@@ -199,11 +200,11 @@ def relevance_probability(view, rowid_target, rowid_query):
             for (a, b) in zip(logps_diff_table, logps_clusters_diff)
         ]
         # Sum the deltas.
-        logp_diff_table = logsumexp([logsumexp(l) for l in logps_delta])
+        logp_diff_table = logsumexp(np.concatenate(logps_delta))
 
         # Confirm logp_same_table + logp_diff_table equal normalizing constant.
         assert np.allclose(
-            logsumexp([logp_same_table, logp_diff_table]),
+            np.logaddexp(logp_same_table, logp_diff_table),
             logp_condition
         )
 
@@ -110,6 +110,7 @@ class View(CGpm):
 
         # -- Dimensions --------------------------------------------------------
         self.dims = dict()
+        self._network = None    # Cached by build_network, reset by dim edits.
         for i, c in enumerate(self.outputs[1:]):
             # Prepare inputs for dim, if necessary.
             dim_inputs = []
@@ -141,12 +142,14 @@ class View(CGpm):
             self._bulk_incorporate(dim)
         self.dims[dim.index] = dim
         self.outputs = self.outputs[:1] + list(self.dims.keys())
+        self._network = None
         return dim.logpdf_score()
 
     def unincorporate_dim(self, dim):
         """Remove dim from this View (does not modify)."""
         del self.dims[dim.index]
         self.outputs = self.outputs[:1] + list(self.dims.keys())
+        self._network = None
         return dim.logpdf_score()
 
     def incorporate(self, rowid, observation, inputs=None):
@@ -181,9 +184,7 @@ class View(CGpm):
         # Account.
         k = self.Zr(rowid)
         self.crp.unincorporate(rowid)
-        if k not in self.Nk():
-            for dim in self.dims.values():
-                del dim.clusters[k]     # XXX Abstract me!
+        self._delete_empty_cluster(k)
 
     # XXX Major hack to force values of NaN cells in incorporated rowids.
     def force_cell(self, rowid, observation):
@@ -385,10 +386,14 @@ class View(CGpm):
     # Internal simulate/logpdf helpers
 
     def build_network(self):
-        return ImportanceNetwork(
-            cgpms=[self.crp.clusters[0]] + list(self.dims.values()),
-            accuracy=1,
-            rng=self.rng)
+        # The network depends only on the set of dims, which changes solely
+        # through incorporate_dim and unincorporate_dim.
+        if self._network is None:
+            self._network = ImportanceNetwork(
+                cgpms=[self.crp.clusters[0]] + list(self.dims.values()),
+                accuracy=1,
+                rng=self.rng)
+        return self._network
 
     # --------------------------------------------------------------------------
     # Internal row transition.
@@ -397,39 +402,58 @@ class View(CGpm):
         # Probability of row crp assignment to each cluster.
         K = self.crp.clusters[0].gibbs_tables(rowid)
         logp_crp = self.crp.clusters[0].gibbs_logps(rowid)
-        # Probability of row data in each cluster.
-        logp_data = self._logpdf_row_gibbs(rowid, K)
-        assert len(logp_data) == len(logp_crp)
-        # Sample new cluster.
-        p_cluster = np.add(logp_data, logp_crp)
-        z_b = gu.log_pflip(p_cluster, array=K, rng=self.rng)
-        # Migrate the row.
-        if self.Zr(rowid) != z_b:
-            self._migrate_row(rowid, z_b)
+        # Hold rowid out of the dims while scoring, and always put it back,
+        # into the sampled cluster or, if anything raises, its old one.
+        for dim in self.dims.values():
+            dim.unincorporate(rowid)
+        try:
+            # Probability of row data in each cluster.
+            logp_data = self._logpdf_row_gibbs(rowid, K)
+            assert len(logp_data) == len(logp_crp)
+            # Sample new cluster.
+            p_cluster = np.add(logp_data, logp_crp)
+            z_b = gu.log_pflip(p_cluster, array=K, rng=self.rng)
+            # Migrate the row.
+            if self.Zr(rowid) != z_b:
+                self._migrate_row(rowid, z_b)
+        finally:
+            k = self.Zr(rowid)
+            for dim in self.dims.values():
+                dim.incorporate(
+                    rowid,
+                    observation={dim.index: self.X[dim.index][rowid]},
+                    inputs=self._get_input_values(rowid, dim, k))
         self._check_partitions()
 
     def _logpdf_row_gibbs(self, rowid, K):
-        return [sum([self._logpdf_cell_gibbs(rowid, dim, k)
-            for dim in self.dims.values()]) for k in K]
+        # Score all clusters in K one dim at a time, then sum across dims.
+        logps = [self._logpdf_dim_gibbs(rowid, dim, K)
+            for dim in self.dims.values()]
+        return np.sum(logps, axis=0) if logps else np.zeros(len(K))
 
-    def _logpdf_cell_gibbs(self, rowid, dim, k):
+    def _logpdf_dim_gibbs(self, rowid, dim, K):
+        # Assumes rowid is not incorporated in dim, see _gibbs_transition_row.
         targets = {dim.index: self.X[dim.index][rowid]}
-        inputs = self._get_input_values(rowid, dim, k)
-        # If rowid in cluster k then unincorporate then compute predictive.
-        if self.Zr(rowid) == k:
-            dim.unincorporate(rowid)
-            logp = dim.logpdf(rowid, targets, None, inputs)
-            dim.incorporate(rowid, targets, inputs)
-        else:
-            logp = dim.logpdf(rowid, targets, None, inputs)
-        return logp
+        # Dim.preprocess copies inputs, so one dict is reused across K.
+        inputs = self._get_input_values(rowid, dim, None)
+        logps = []
+        for k in K:
+            inputs[self.outputs[0]] = k
+            logps.append(dim.logpdf(rowid, targets, None, inputs))
+        return logps
 
     def _migrate_row(self, rowid, k):
-        self.unincorporate(rowid)
-        observation = merged(
-            {d: self.X[d][rowid] for d in self.dims},
-            {self.outputs[0]: k})
-        self.incorporate(rowid, observation)
+        # Move the crp assignment only, rowid is held out of the dims.
+        k_old = self.Zr(rowid)
+        self.crp.unincorporate(rowid)
+        self.crp.incorporate(rowid, {self.outputs[0]: k}, {-1: 0})
+        self._delete_empty_cluster(k_old)
+
+    def _delete_empty_cluster(self, k):
+        # Drop cluster k from the dims once the crp has no rows at table k.
+        if k not in self.Nk():
+            for dim in self.dims.values():
+                del dim.clusters[k]     # XXX Abstract me!
 
     # --------------------------------------------------------------------------
     # Internal crp utils.
@@ -466,13 +490,11 @@ class View(CGpm):
         if self.hypothetical(rowid):
             return constraints
         # Retrieve all values for this rowid not in targets or constraints.
+        exclude = frozenset(targets).union(constraints)
         data = {
             c: self.X[c][rowid]
             for c in self.outputs[1:]
-            if \
-                c not in targets \
-                and c not in constraints \
-                and not isnan(self.X[c][rowid])
+            if c not in exclude and not isnan(self.X[c][rowid])
         }
         # Add the cluster assignment.
         data[self.outputs[0]] = self.Zr(rowid)
@@ -542,6 +564,7 @@ class View(CGpm):
         rowids = list(range(self.n_rows()))
         assert set(Zr.keys()) == set(rowids)
         assert set(Zr.values()) == set(Nk)
+        Z = np.asarray([Zr[r] for r in rowids], dtype=int)
         for i, dim in self.dims.items():
             # Assert first output is first input of the Dim.
             assert self.outputs[0] == dim.inputs[0]
@@ -554,15 +577,16 @@ class View(CGpm):
             assert set(assignments.values()) == set(Nk.keys())
             all_ks = list(dim.clusters.keys()) + list(dim.Zi.values())
             assert set(all_ks) == set(Nk.keys())
+            # Law of conservation of rowids.
+            cols = [dim.index]
+            if dim.is_conditional():
+                cols.extend(dim.inputs[1:])
+            data = np.asarray([self.X[c] for c in cols], dtype=float)
+            rowids_nan = np.any(np.isnan(data), axis=0)
+            nan_counts = np.bincount(
+                Z, weights=rowids_nan, minlength=max(Nk) + 1 if Nk else 0)
             for k in dim.clusters:
-                # Law of conservation of rowids.
-                rowids_k = [r for r in rowids if Zr[r]==k]
-                cols = [dim.index]
-                if dim.is_conditional():
-                    cols.extend(dim.inputs[1:])
-                data = [[self.X[c][r] for c in cols] for r in rowids_k]
-                rowids_nan = np.any(np.isnan(data), axis=1) if data else []
-                assert (dim.clusters[k].N + np.sum(rowids_nan) == Nk[k])
+                assert (dim.clusters[k].N + nan_counts[k] == Nk[k])
 
     # --------------------------------------------------------------------------
     # Metadata
@@ -39,22 +39,30 @@ class ImportanceNetwork(object):
         self.extraneous = hu.retrieve_extraneous_inputs(self.cgpms, self.v_to_c)
         self.topo = hu.topological_sort(self.adjacency)
 
-    @gu.simulate_many
     def simulate(self, rowid, targets, constraints=None, inputs=None, N=None):
         if constraints is None:
             constraints = {}
         if inputs is None:
             inputs = {}
-        samples, weights = list(zip(*[
-            self.weighted_sample(rowid, targets, constraints, inputs)
-            for _i in range(self.accuracy)
-        ]))
-        if all(isinf(l) for l in weights):
-            raise ValueError('Zero density constraints: %s' % (constraints,))
-        # Skip an expensive random choice if there is only one option.
-        index = 0 if self.accuracy == 1 else \
-            gu.log_pflip(weights, rng=self.rng)
-        return {q: samples[index][q] for q in targets}
+        # The required inputs are a function of the query only, so retrieve
+        # them once for all the N * accuracy weighted samples.
+        targets_required = self.retrieve_required_inputs(targets, constraints)
+        def simulate_one():
+            samples, weights = list(zip(*[
+                self.weighted_sample(
+                    rowid, targets, constraints, inputs, targets_required)
+                for _i in range(self.accuracy)
+            ]))
+            if all(isinf(l) for l in weights):
+                raise ValueError(
+                    'Zero density constraints: %s' % (constraints,))
+            # Skip an expensive random choice if there is only one option.
+            index = 0 if self.accuracy == 1 else \
+                gu.log_pflip(weights, rng=self.rng)
+            return {q: samples[index][q] for q in targets}
+        if N is None:
+            return simulate_one()
+        return [simulate_one() for _i in range(N)]
 
     def logpdf(self, rowid, targets, constraints=None, inputs=None):
         if constraints is None:
@@ -62,15 +70,20 @@ class ImportanceNetwork(object):
         if inputs is None:
             inputs = {}
         # Compute joint probability.
+        constraints_joint = gu.merged(targets, constraints)
+        required_joint = self.retrieve_required_inputs([], constraints_joint)
         samples_joint, weights_joint = list(zip(*[
             self.weighted_sample(
-                rowid, [], gu.merged(targets, constraints), inputs)
+                rowid, [], constraints_joint, inputs, required_joint)
             for _i in range(self.accuracy)
         ]))
         logp_joint = gu.logmeanexp(weights_joint)
         # Compute marginal probability.
+        required_marginal = self.retrieve_required_inputs([], constraints) \
+            if constraints else []
         samples_marginal, weights_marginal = list(zip(*[
-            self.weighted_sample(rowid, [], constraints, inputs)
+            self.weighted_sample(
+                rowid, [], constraints, inputs, required_marginal)
             for _i in range(self.accuracy)
         ])) if constraints else ({}, [0.])
         if all(isinf(l) for l in weights_marginal):
@@ -79,8 +92,11 @@ class ImportanceNetwork(object):
         # Return log ratio.
         return logp_joint - logp_constraints
 
-    def weighted_sample(self, rowid, targets, constraints, inputs):
-        targets_required = self.retrieve_required_inputs(targets, constraints)
+    def weighted_sample(
+            self, rowid, targets, constraints, inputs, targets_required=None):
+        if targets_required is None:
+            targets_required = self.retrieve_required_inputs(
+                targets, constraints)
         targets_all = targets + targets_required
         sample = dict(constraints)
         weight = 0
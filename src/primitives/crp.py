@@ -18,6 +18,8 @@ from builtins import range
 from collections import OrderedDict
 from math import log
 
+import numpy as np
+
 from scipy.special import gammaln
 
 from cgpm.primitives.distribution import DistributionGpm
@@ -182,8 +184,21 @@ class Crp(DistributionGpm):
         denominator = N + alpha
         return log(numerator) - log(denominator)
 
+    @staticmethod
+    def calc_logpdf_score_grid(hyper, grid, clusters):
+        """Compute the summed logpdf_score of clusters at every grid value."""
+        if hyper != 'alpha':
+            raise ValueError('Unknown crp hyperparameter: %s' % (hyper,))
+        grid = np.asarray(grid)
+        logps = np.zeros(len(grid))
+        for cluster in clusters:
+            logps += Crp.calc_logpdf_marginal(cluster.N, cluster.counts, grid)
+        return logps
+
     @staticmethod
     def calc_logpdf_marginal(N, counts, alpha):
         # http://gershmanlab.webfactional.com/pubs/GershmanBlei12.pdf#page=4 (eq 8)
-        return len(counts) * log(alpha) + sum(gammaln(list(counts.values()))) \
+        # Vectorizes over alpha, which may be a scalar or an array of values.
+        return len(counts) * np.log(alpha) \
+            + sum(gammaln(list(counts.values()))) \
             + gammaln(alpha) - gammaln(N + alpha)
@@ -226,10 +226,10 @@ class RandomForest(CGpm):
         else:
             index = list(regressor.classes_).index(x)
             logp_rf = regressor.predict_log_proba([y])[0][index]
-            return gu.logsumexp([
+            return np.logaddexp(
                 np.log(alpha) + logp_uniform,
                 np.log(1-alpha) + logp_rf
-            ])
+            )
 
 
     def to_metadata(self):
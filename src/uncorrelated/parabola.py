@@ -16,7 +16,6 @@
 
 import numpy as np
 
-from scipy.misc import logsumexp
 from scipy.stats import uniform
 
 from cgpm.cgpm import CGpm
@@ -62,10 +61,10 @@ class ParabolaY(CGpm):
         assert not constraints
         x = inputs[self.inputs[0]]
         y = targets[self.outputs[0]]
-        return logsumexp([
+        return np.logaddexp(
             np.log(.5)+self.uniform.logpdf(y-x**2),
             np.log(.5)+self.uniform.logpdf(-y-x**2)
-        ])
+        )
 
 
 class Parabola(DirectedXyGpm):
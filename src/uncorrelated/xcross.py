@@ -17,7 +17,6 @@
 import numpy as np
 
 from cgpm.uncorrelated.undirected import UnDirectedXyGpm
-from cgpm.utils import general as gu
 from cgpm.utils import mvnormal as multivariate_normal
 
 
@@ -25,18 +24,22 @@ class XCross(UnDirectedXyGpm):
     """Y = (+/- w.p .5) X + N(0,noise)."""
 
     def simulate_joint(self):
+        # Transform standard normals by the closed-form Cholesky factor of
+        # the chosen unit-variance covariance, rather than factoring the
+        # covariance inside multivariate_normal on every draw.
         if self.rng.rand() < .5:
-            cov = np.array([[1,1-self.noise],[1-self.noise,1]])
+            rho = 1 - self.noise
         else:
-            cov = np.array([[1,-1+self.noise],[-1+self.noise,1]])
-        return self.rng.multivariate_normal([0,0], cov=cov)
+            rho = -1 + self.noise
+        z0, z1 = self.rng.normal(size=2)
+        return np.array([z0, rho*z0 + np.sqrt(1 - rho**2)*z1])
 
     def logpdf_joint(self, x, y):
         X = np.array([x, y])
         Mu = np.array([0, 0])
         Sigma0 = np.array([[1, 1 - self.noise], [1 - self.noise, 1]])
         Sigma1 = np.array([[1, -1 + self.noise], [-1 + self.noise, 1]])
-        return gu.logsumexp([
+        return np.logaddexp(
             np.log(.5)+multivariate_normal.logpdf(X, Mu, Sigma0),
             np.log(.5)+multivariate_normal.logpdf(X, Mu, Sigma1),
-        ])
+        )
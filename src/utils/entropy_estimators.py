@@ -6,17 +6,18 @@
 from __future__ import print_function
 from __future__ import division
 from builtins import zip
-from builtins import map
 from builtins import range
 from past.utils import old_div
 import numpy as np
 import numpy.random as nr
-import random
 import scipy.spatial as ss
 
+from collections import Counter
 from math import log, pi
 from scipy.special import digamma, gamma
 
+from cgpm.utils.parallel_map import parallel_map
+
 # CONTINUOUS ESTIMATORS
 
 def entropy(x, k=3, base=2):
@@ -28,11 +29,12 @@ def entropy(x, k=3, base=2):
   d = len(x[0])
   N = len(x)
   intens = 1e-10 # Small noise to break degeneracy, see doc.
-  x = [list(p + intens*nr.rand(len(x[0]))) for p in x]
+  x = np.asarray(x, dtype=float)
+  x = x + intens*nr.rand(*x.shape)
   tree = ss.cKDTree(x)
-  nn = [tree.query(point, k+1, p=float('inf'))[0][k] for point in x]
+  nn = tree.query(x, [k+1], p=float('inf'))[0][:,0]
   const = digamma(N) - digamma(k) + d*log(2)
-  return old_div((const + d*np.mean(list(map(log, nn)))), log(base))
+  return old_div((const + d*np.log(nn).mean()), log(base))
 
 def mi(x, y, k=3, base=2):
   """Mutual information of x and y.
@@ -42,12 +44,14 @@ def mi(x, y, k=3, base=2):
   assert len(x)==len(y), 'Lists should have same length.'
   assert k <= len(x) - 1, 'Set k smaller than num samples - 1.'
   intens = 1e-10 # Small noise to break degeneracy, see doc.
-  x = [list(p + intens*nr.rand(len(x[0]))) for p in x]
-  y = [list(p + intens*nr.rand(len(y[0]))) for p in y]
+  x = np.asarray(x, dtype=float)
+  x = x + intens*nr.rand(*x.shape)
+  y = np.asarray(y, dtype=float)
+  y = y + intens*nr.rand(*y.shape)
   points = zip2(x,y)
   # Find nearest neighbors in joint space, p=inf means max-norm.
   tree = ss.cKDTree(points)
-  dvec = [tree.query(point, k+1, p=float('inf'))[0][k] for point in points]
+  dvec = tree.query(points, [k+1], p=float('inf'))[0][:,0]
   a = avgdigamma(x,dvec)
   b = avgdigamma(y,dvec)
   c = digamma(k)
@@ -62,13 +66,16 @@ def cmi(x, y, z, k=3, base=2):
   assert len(x)==len(y), 'Lists should have same length.'
   assert k <= len(x) - 1, 'Set k smaller than num samples - 1.'
   intens = 1e-10 # Small noise to break degeneracy, see doc.
-  x = [list(p + intens*nr.rand(len(x[0]))) for p in x]
-  y = [list(p + intens*nr.rand(len(y[0]))) for p in y]
-  z = [list(p + intens*nr.rand(len(z[0]))) for p in z]
+  x = np.asarray(x, dtype=float)
+  x = x + intens*nr.rand(*x.shape)
+  y = np.asarray(y, dtype=float)
+  y = y + intens*nr.rand(*y.shape)
+  z = np.asarray(z, dtype=float)
+  z = z + intens*nr.rand(*z.shape)
   points = zip2(x,y,z)
   # Find nearest neighbors in joint space, p=inf means max-norm.
   tree = ss.cKDTree(points)
-  dvec = [tree.query(point, k+1, p=float('inf'))[0][k] for point in points]
+  dvec = tree.query(points, [k+1], p=float('inf'))[0][:,0]
   a = avgdigamma(zip2(x,z), dvec)
   b = avgdigamma(zip2(y,z), dvec)
   c = avgdigamma(z,dvec)
@@ -89,10 +96,10 @@ def kldiv(x, xp, k=3, base=2):
   const = log(m) - log(n-1)
   tree = ss.cKDTree(x)
   treep = ss.cKDTree(xp)
-  nn = [tree.query(point, k+1, p=float('inf'))[0][k] for point in x]
-  nnp = [treep.query(point, k, p=float('inf'))[0][k-1] for point in x]
-  return old_div((const + d * np.mean(list(map(log, nnp))) \
-    - d * np.mean(list(map(log, nn)))), log(base))
+  nn = tree.query(x, [k+1], p=float('inf'))[0][:,0]
+  nnp = treep.query(x, [k], p=float('inf'))[0][:,0]
+  return old_div((const + d * np.log(nnp).mean() \
+    - d * np.log(nn).mean()), log(base))
 
 # DISCRETE ESTIMATORS
 def entropyd(sx, base=2):
@@ -117,21 +124,15 @@ def cmidd(x, y, z, base=2):
 
 def hist(sx):
   """Histogram from list of samples."""
-  d = dict()
-  for s in sx:
-    d[s] = d.get(s,0) + 1
-  return [float(z)/len(sx) for z in list(d.values())]
+  counts = np.fromiter(Counter(sx).values(), dtype=float)
+  return counts / len(sx)
 
 def entropyfromprobs(probs, base=2):
   # Turn a normalized list of probabilities of discrete outcomes into entropy.
-  return old_div(-sum(map(elog, probs)), log(base))
-
-def elog(x):
   # For entropy, 0 log 0 = 0. but we get an error for putting log 0.
-  if x <= 0. or x>=1.:
-    return 0
-  else:
-    return x*log(x)
+  p = np.asarray(probs, dtype=float)
+  p = p[(0. < p) & (p < 1.)]
+  return old_div(-np.sum(p*np.log(p)), log(base))
 
 # MIXED ESTIMATORS
 def micd(x, y, k=3, base=2, warning=True):
@@ -160,20 +161,19 @@ def vectorize(scalarlist):
   """Turn a list of scalars into a list of one-d vectors."""
   return [(x,) for x in scalarlist]
 
-def shuffle_test(measure,x,y,z=False,ns=60,ci=0.95,**kwargs):
+def shuffle_test(measure,x,y,z=False,ns=60,ci=0.95,multiprocess=0,**kwargs):
   """Repeatedly shuffle the x-values and then estimate measure(x,y,[z]).
   Returns the mean and conf. interval ('ci=0.95' default) over 'ns' runs.
   `measure` could me mi,cmi, e.g. Keyword arguments can be passed. mi and cmi
-  should have a mean near zero.
+  should have a mean near zero. Each shuffle draws its own seed up front, for
+  both the permutation and the global numpy.random state that the measure's
+  dequantization noise is drawn from, so the outputs do not depend on
+  `multiprocess`.
   """
-  xp = x[:] # A copy that we can shuffle.
-  outputs = []
-  for i in range(ns):
-    random.shuffle(xp)
-    if z:
-      outputs.append(measure(xp, y, z, **kwargs))
-    else:
-      outputs.append(measure(xp, y, **kwargs))
+  mapper = parallel_map if multiprocess else map
+  seeds = nr.randint(low=1, high=2**32-1, size=ns)
+  args = [(measure, x, y, z, seed, kwargs) for seed in seeds]
+  outputs = list(mapper(_shuffle_measure, args))
   outputs.sort()
   return outputs
   # return np.mean(outputs), (outputs[int((1.-ci)/2*ns)], \
@@ -181,25 +181,35 @@ def shuffle_test(measure,x,y,z=False,ns=60,ci=0.95,**kwargs):
 
 # INTERNAL FUNCTIONS
 
+def _shuffle_measure(measure_x_y_z_seed_kwargs):
+  (measure, x, y, z, seed, kwargs) = measure_x_y_z_seed_kwargs
+  rng = nr.RandomState(seed)
+  xp = [x[i] for i in rng.permutation(len(x))]
+  # Seed the global noise used by mi/cmi, then restore the caller's state.
+  state = nr.get_state()
+  nr.seed(rng.randint(low=1, high=2**32-1))
+  try:
+    if z:
+      return measure(xp, y, z, **kwargs)
+    else:
+      return measure(xp, y, **kwargs)
+  finally:
+    nr.set_state(state)
+
 def avgdigamma(points, dvec):
   # This part finds number of neighbors in some radius in the marginal space
   # returns expectation value of <psi(nx)>.
-  N = len(points)
   tree = ss.cKDTree(points)
-  avg = 0.
-  for i in range(N):
-    dist = dvec[i]
-    # Subtlety, we don't include the boundary point,
-    # but we are implicitly adding 1 to kraskov def bc center point is included.
-    num_points = len(tree.query_ball_point(points[i], dist-1e-15,
-      p=float('inf')))
-    avg += old_div(digamma(num_points), N)
-  return avg
+  # Subtlety, we don't include the boundary point,
+  # but we are implicitly adding 1 to kraskov def bc center point is included.
+  num_points = tree.query_ball_point(points, np.asarray(dvec)-1e-15,
+    p=float('inf'), return_length=True)
+  return digamma(num_points).mean()
 
 def zip2(*args):
-  #zip2(x,y) takes the lists of vectors and makes it a list of vectors in a joint space
+  #zip2(x,y) takes the arrays of vectors and makes it an array of vectors in a joint space
   #E.g. zip2([[1],[2],[3]],[[4],[5],[6]]) = [[1,4],[2,5],[3,6]]
-  return [sum(sublist,[]) for sublist in zip(*args)]
+  return np.hstack([np.asarray(a) for a in args])
 
 if __name__ == "__main__":
   print("NPEET: Non-parametric entropy estimation toolbox. See readme.pdf for details on usage.")
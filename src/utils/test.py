@@ -17,13 +17,10 @@
 from __future__ import division
 from builtins import zip
 from builtins import range
-from past.utils import old_div
 import math
 
 import numpy as np
 
-from scipy.stats import norm
-
 from cgpm.crosscat.engine import Engine
 from cgpm.crosscat.state import State
 from cgpm.mixtures.dim import Dim
@@ -32,7 +29,7 @@ from cgpm.utils import general as gu
 
 
 def gen_data_table(n_rows, view_weights, cluster_weights, cctypes, distargs,
-        separation, view_partition=None, rng=None):
+        separation, view_partition=None, rng=None, dtype=np.float64):
     """Generates data, partitions, and Dim.
 
      Parameters
@@ -55,6 +52,9 @@ def gen_data_table(n_rows, view_weights, cluster_weights, cctypes, distargs,
         An n_cols length list of values between [0,1], where seperation[i] is
         the seperation of clusters in column i. Values closer to 1 imply higher
         seperation.
+     dtype : np.dtype, optional
+        Floating point type of the returned data table, np.float64 by
+        default. Use np.float32 to halve the memory of large tables.
 
      Returns
      -------
@@ -96,7 +96,7 @@ def gen_data_table(n_rows, view_weights, cluster_weights, cctypes, distargs,
     assert len(Zc) == len(set(Zv))
     assert len(Zc[0]) == n_rows
 
-    T = np.zeros((n_cols, n_rows))
+    T = np.zeros((n_cols, n_rows), dtype=dtype)
 
     for col in range(n_cols):
         cctype = cctypes[col]
@@ -121,32 +121,20 @@ def gen_dims_from_structure(T, Zv, Zc, cctypes, distargs):
     return dims
 
 def _gen_beta_data(Z, rng, separation=.9, distargs=None):
-    n_rows = len(Z)
+    Z = np.asarray(Z)
 
     K = np.max(Z)+1
     alphas = np.linspace(.5 - .5*separation*.85, .5 + .5*separation*.85, K)
-    Tc = np.zeros(n_rows)
+    # Density of N(.5, .25**2) at alphas, without scipy.stats dispatch.
+    pdfs = np.exp(-.5*((alphas-.5)/.25)**2) / (.25*math.sqrt(2*math.pi))
+    betas = (1.-alphas) * 20. * pdfs
+    alphas = alphas * 20. * pdfs
 
-    for r in range(n_rows):
-        cluster = Z[r]
-        alpha = alphas[cluster]
-        beta = (1.-alpha) * 20.* (norm.pdf(alpha, .5, .25))
-        alpha *= 20. * norm.pdf(alpha, .5, .25)
-        Tc[r] = rng.beta(alpha, beta)
-
-    return Tc
+    return rng.beta(alphas[Z], betas[Z])
 
 def _gen_normal_data(Z, rng, separation=.9, distargs=None):
-    n_rows = len(Z)
-
-    Tc = np.zeros(n_rows)
-    for r in range(n_rows):
-        cluster = Z[r]
-        mu = cluster * (5.*separation)
-        sigma = 1.0
-        Tc[r] = rng.normal(loc=mu, scale=sigma)
-
-    return Tc
+    mus = np.asarray(Z) * (5.*separation)
+    return rng.normal(loc=mus, scale=1.0)
 
 def _gen_normal_trunc_data(Z, rng, separation=.9, distargs=None):
     l, h = distargs['l'], distargs['h']
@@ -161,105 +149,67 @@ def _gen_normal_trunc_data(Z, rng, separation=.9, distargs=None):
     distances = [mean - bc for bc in bin_centers]
     mus = [bc + (1-separation)*d for bc, d in zip(bin_centers, distances)]
 
+    # Rejection sample all rows at once, redrawing only the rejected rows.
+    mus = np.asarray(mus)[np.asarray(Z)]
+    sigma = 1
     Tc = np.zeros(n_rows)
-    for r in range(n_rows):
-        cluster = Z[r]
-        sigma = 1
-        i = 0
-        while True:
-            i += 1
-            x = rng.normal(loc=mus[cluster], scale=sigma)
-            if l <= x <= h:
-                break
-            if max_draws < i:
-                raise ValueError('Could not generate normal_trunc data.')
-        Tc[r] = x
+    pending = np.arange(n_rows)
+    for _ in range(max_draws):
+        x = rng.normal(loc=mus[pending], scale=sigma)
+        accept = (l <= x) & (x <= h)
+        Tc[pending[accept]] = x[accept]
+        pending = pending[~accept]
+        if len(pending) == 0:
+            break
+    else:
+        raise ValueError('Could not generate normal_trunc data.')
 
     return Tc
 
 def _gen_vonmises_data(Z, rng, separation=.9, distargs=None):
-    n_rows = len(Z)
+    Z = np.asarray(Z)
 
-    num_clusters = max(Z)+1
-    sep = old_div(2*math.pi, num_clusters)
+    num_clusters = np.max(Z)+1
+    sep = 2*math.pi / num_clusters
 
-    mus = [c*sep for c in range(num_clusters)]
-    std = old_div(sep,(5.*separation**.75))
-    k = old_div(1, (std*std))
+    mus = np.arange(num_clusters) * sep
+    std = sep / (5.*separation**.75)
+    k = 1. / (std*std)
 
-    Tc = np.zeros(n_rows)
-    for r in range(n_rows):
-        cluster = Z[r]
-        mu = mus[cluster]
-        Tc[r] = rng.vonmises(mu, k) + math.pi
-
-    return Tc
+    return rng.vonmises(mus[Z], k) + math.pi
 
 def _gen_poisson_data(Z, rng, separation=.9, distargs=None):
-    n_rows = len(Z)
-    Tc = np.zeros(n_rows)
-
-    for r in range(n_rows):
-        cluster = Z[r]
-        lam = cluster * (4.*separation) + 1
-        Tc[r] = rng.poisson(lam)
-
-    return Tc
+    lams = np.asarray(Z) * (4.*separation) + 1
+    return rng.poisson(lams).astype(float)
 
 def _gen_exponential_data(Z, rng, separation=.9, distargs=None):
-    n_rows = len(Z)
-    Tc = np.zeros(n_rows)
-
-    for r in range(n_rows):
-        cluster = Z[r]
-        mu = cluster * (4.*separation) + 1
-        Tc[r] = rng.exponential(mu)
-
-    return Tc
+    mus = np.asarray(Z) * (4.*separation) + 1
+    return rng.exponential(mus)
 
 def _gen_geometric_data(Z, rng, separation=.9, distargs=None):
-    n_rows = len(Z)
-    Tc = np.zeros(n_rows)
+    Z = np.asarray(Z)
     K = np.max(Z)+1
 
     ps = np.linspace(.5 - .5*separation*.85, .5 + .5*separation*.85, K)
-    Tc = np.zeros(n_rows)
-    for r in range(n_rows):
-        cluster = Z[r]
-        Tc[r] = rng.geometric(ps[cluster]) -1
-
-    return Tc
+    return (rng.geometric(ps[Z]) - 1).astype(float)
 
 def _gen_lognormal_data(Z, rng, separation=.9, distargs=None):
-    n_rows = len(Z)
+    Z = np.asarray(Z, dtype=float)
 
     if separation > .9:
         separation = .9
 
-    Tc = np.zeros(n_rows)
-    for r in range(n_rows):
-        cluster = Z[r]
-        mu = cluster * (.9*separation**2)
-        Tc[r] = rng.lognormal(mean=mu, sigma=old_div((1.-separation),(cluster+1.)))
-
-    return Tc
+    mus = Z * (.9*separation**2)
+    sigmas = (1.-separation) / (Z+1.)
+    return rng.lognormal(mean=mus, sigma=sigmas)
 
 def _gen_bernoulli_data(Z, rng, separation=.9, distargs=None):
-    n_rows = len(Z)
+    Z = np.asarray(Z)
 
-    Tc = np.zeros(n_rows)
-    K = max(Z)+1
+    K = np.max(Z)+1
     thetas = np.linspace(0., separation, K)
 
-    for r in range(n_rows):
-        cluster = Z[r]
-        theta = thetas[cluster]
-        x = 0.0
-        if rng.rand() < theta:
-            x = 1.0
-        Tc[r] = x
-
-    return Tc
+    return (rng.rand(len(Z)) < thetas[Z]).astype(float)
 
 def _gen_categorical_data(Z, rng, separation=.9, distargs=None):
     k = int(distargs['k'])
@@ -268,39 +218,41 @@ def _gen_categorical_data(Z, rng, separation=.9, distargs=None):
     if separation > .95:
         separation = .95
 
-    Tc = np.zeros(n_rows, dtype=int)
-    C = max(Z)+1
-    theta_arrays = [rng.dirichlet(np.ones(k)*(1.-separation), 1)
-        for _ in range(C)]
+    Z = np.asarray(Z)
+    C = np.max(Z)+1
+    thetas = rng.dirichlet(np.ones(k)*(1.-separation), size=C)
 
-    for r in range(n_rows):
-        cluster = Z[r]
-        thetas = theta_arrays[cluster][0]
-        x = gu.pflip(thetas, rng=rng)
-        Tc[r] = int(x)
-    return Tc
+    # Inverse-cdf sampling: the category of row r is the number of entries
+    # in the cdf of its cluster which lie below a uniform draw.
+    cdfs = np.cumsum(thetas, axis=1)
+    u = rng.rand(n_rows)
+    Tc = np.sum(cdfs[Z] < u[:,np.newaxis], axis=1)
+    return np.minimum(Tc, k-1)
 
 def gen_partition(N, weights, rng):
     assert all(w != 0 for w in weights)
     assert np.allclose(sum(weights), 1)
     K = len(weights)
     assert K <= N    # XXX FIXME
-    Z = list(range(K))
-    Z.extend(int(gu.pflip(weights, rng=rng)) for _ in range(N-K))
+    Z = np.empty(N, dtype=int)
+    Z[:K] = np.arange(K)
+    Z[K:] = gu.pflip(weights, size=N-K, rng=rng)
     rng.shuffle(Z)
-    return Z
+    return Z.tolist()
 
 def column_average_ari(Zv, Zc, cc_state_object):
     from sklearn.metrics import adjusted_rand_score
     ari = 0
     n_cols = len(Zv)
+    # Fetch the inferred row partition of each view once, not once per column.
+    Zc_inferred = {}
+    for v, view in cc_state_object.views.items():
+        Zr = view.Zr()
+        Zc_inferred[v] = [Zr[r] for r in sorted(Zr)]
     for col in range(n_cols):
         view_t = Zv[col]
-        Zc_true = Zc[view_t]
-
-        view_i = cc_state_object.Zv[col]
-        Zc_inferred = cc_state_object.views[view_i].Z.tolist()
-        ari += adjusted_rand_score(Zc_true, Zc_inferred)
+        view_i = cc_state_object.Zv(col)
+        ari += adjusted_rand_score(Zc[view_t], Zc_inferred[view_i])
 
     return ari/float(n_cols)
 
@@ -22,6 +22,7 @@ import pytest
 
 import numpy as np
 
+from cgpm.mixtures.dim import Dim
 from cgpm.primitives.crp import Crp
 from cgpm.utils import general as gu
 
@@ -394,3 +395,23 @@ def test_crp_same_table_probability():
     # Confirm no mutation has occured.
     assert crp.data == crp_data_full
     assert crp.logpdf_score() == logpdf_score_full
+
+
+def test_crp_dim_hyper_grid_vectorized():
+    # The closed-form grid score must agree with scoring each grid point
+    # through set_hypers/logpdf_score, as Dim does for other models.
+    rng = gu.gen_rng(2)
+    crp = Dim(outputs=[0], inputs=[-1], cctype='crp', rng=rng)
+    crp.transition_hyper_grids([1]*40)
+    for rowid in range(40):
+        s = crp.simulate(rowid, [0], None, {-1:0})
+        crp.incorporate(rowid, s, {-1:0})
+    grid = crp.hyper_grids['alpha']
+    logps_vectorized = crp._logpdf_score_grid('alpha')
+    logps_loop = []
+    for grid_value in grid:
+        crp.clusters[0].set_hypers({'alpha': grid_value})
+        logps_loop.append(crp.clusters[0].logpdf_score())
+    assert np.allclose(logps_vectorized, logps_loop)
+    with pytest.raises(ValueError):
+        Crp.calc_logpdf_score_grid('beta', grid, [crp.clusters[0]])
@@ -69,18 +69,18 @@ def engine():
         rng=gu.gen_rng(0)
     )
     e.transition(N=2)
-    return e.to_metadata()
+    return e
 
 
 def test_logpdf__ci_(engine):
-    engine = Engine.from_metadata(engine)
+    num_states = engine.num_states()
 
     def test_correct_dimensions(rowid, targets, constraints, statenos):
         # logpdfs should be a list of floats.
         logpdfs = engine.logpdf(
             rowid, targets, constraints=constraints, statenos=statenos)
         assert len(logpdfs) == (
-            engine.num_states() if statenos is None else len(statenos))
+            num_states if statenos is None else len(statenos))
         for state_logpdfs in logpdfs:
             # Each element in logpdfs should be a single float.
             assert isinstance(state_logpdfs, float)
@@ -95,19 +95,20 @@ def test_logpdf__ci_(engine):
 
 
 def test_simulate__ci_(engine):
-    engine = Engine.from_metadata(engine)
+    num_states = engine.num_states()
 
     def test_correct_dimensions(rowid, targets, constraints, N, statenos):
         samples = engine.simulate(
             rowid, targets, constraints=constraints, N=N, statenos=statenos)
         assert len(samples) == (
-            engine.num_states() if statenos is None else len(statenos))
+            num_states if statenos is None else len(statenos))
+        targets_set = set(targets)
         for states_samples in samples:
             # Each element of samples should be a list of N samples.
             assert len(states_samples) == N
             for s in states_samples:
                 # Each raw sample should be len(Q) dimensional.
-                assert set(s.keys()) == set(targets)
+                assert set(s.keys()) == targets_set
                 assert len(s) == len(targets)
         s = engine._likelihood_weighted_resample(
             samples, rowid, constraints=constraints, statenos=statenos)
@@ -128,7 +129,6 @@ def test_simulate__ci_(engine):
 
 
 def test_logpdf_bulk__ci_(engine):
-    engine = Engine.from_metadata(engine)
     rowid1, targets1, constraints1 = 5, {0:0}, {2:1, 3:.5}
     rowid2, targets2, constraints2 = -1, {1:0, 4:.8}, {5:.5}
     # Bulk.
@@ -140,8 +140,8 @@ def test_logpdf_bulk__ci_(engine):
         # Invoke
         logpdfs = engine.logpdf_bulk(rowids, targets_list,
             constraints_list=constraints_list, statenos=statenos)
-        assert len(logpdfs) == \
-            engine.num_states() if statenos is None else len(statenos)
+        assert len(logpdfs) == (
+            engine.num_states() if statenos is None else len(statenos))
         for state_logpdfs in logpdfs:
             # state_logpdfs should be a list of floats, one float per targets.
             assert len(state_logpdfs) == len(rowids)
@@ -153,7 +153,6 @@ def test_logpdf_bulk__ci_(engine):
 
 
 def test_simulate_bulk__ci_(engine):
-    engine = Engine.from_metadata(engine)
     rowid1, targets1, constraints1, N1, = -1, [0,2,4,5], {3:1}, 7
     rowid2, targets2, constraints2, N2 = 5, [1,3], {2:1}, 3
     rowid3, targets3, constraints3, N3 = 8, [0], {4:.8}, 3
@@ -162,6 +161,8 @@ def test_simulate_bulk__ci_(engine):
     targets_list = [targets1, targets2, targets3]
     constraints_list = [constraints1, constraints2, constraints3]
     Ns = [N1, N2, N3]
+    num_states = engine.num_states()
+    targets_sets = [set(targets) for targets in targets_list]
 
     def test_correct_dimensions(statenos):
         # Invoke
@@ -169,13 +170,13 @@ def test_simulate_bulk__ci_(engine):
             rowids, targets_list, constraints_list=constraints_list,
             Ns=Ns, statenos=statenos)
         assert len(samples) == (
-            engine.num_states() if statenos is None else len(statenos))
+            num_states if statenos is None else len(statenos))
         for states_samples in samples:
             assert len(states_samples) == len(rowids)
             for i, sample in enumerate(states_samples):
                 assert len(sample) == Ns[i]
                 for s in sample:
-                    assert set(s.keys()) == set(targets_list[i])
+                    assert set(s.keys()) == targets_sets[i]
                     assert len(s) == len(targets_list[i])
 
     test_correct_dimensions(None)
@@ -183,8 +184,6 @@ def test_simulate_bulk__ci_(engine):
 
 
 def test_dependence_probability__ci_(engine):
-    engine = Engine.from_metadata(engine)
-
     results = engine.dependence_probability(0, 2, statenos=None)
     assert len(results) == engine.num_states()
 
@@ -192,8 +191,6 @@ def test_dependence_probability__ci_(engine):
     assert len(results) == 2
 
 def test_row_similarity__ci_(engine):
-    engine = Engine.from_metadata(engine)
-
     results = engine.row_similarity(0, 2, statenos=None)
     assert len(results) == engine.num_states()
 
@@ -201,8 +198,6 @@ def test_row_similarity__ci_(engine):
     assert len(results) == 3
 
 def test_relevance_probability__ci_(engine):
-    engine = Engine.from_metadata(engine)
-
     results = engine.relevance_probability(0, [2, 14], 0, statenos=None)
     assert len(results) == engine.num_states()
 
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2015-2016 MIT Probabilistic Computing Project
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import numpy.random as nr
+
+from cgpm.utils import entropy_estimators as ee
+from cgpm.utils import general as gu
+
+
+def get_samples():
+    # Integer samples have ties, which only the dequantization noise breaks,
+    # so the estimates are sensitive to how that noise is seeded.
+    rng = gu.gen_rng(0)
+    x = rng.randint(0, 3, size=(50, 1)).tolist()
+    y = rng.randint(0, 3, size=(50, 1)).tolist()
+    z = rng.randint(0, 3, size=(50, 1)).tolist()
+    return x, y, z
+
+
+def test_shuffle_test_reproducible():
+    x, y, z = get_samples()
+    nr.seed(4)
+    outputs_mi = ee.shuffle_test(ee.mi, x, y, ns=4)
+    nr.seed(4)
+    assert ee.shuffle_test(ee.mi, x, y, ns=4) == outputs_mi
+    nr.seed(4)
+    outputs_cmi = ee.shuffle_test(ee.cmi, x, y, z, ns=3, k=2)
+    nr.seed(4)
+    assert ee.shuffle_test(ee.cmi, x, y, z, ns=3, k=2) == outputs_cmi
+
+
+def test_shuffle_test_multiprocess():
+    x, y, _z = get_samples()
+    nr.seed(4)
+    outputs_serial = ee.shuffle_test(ee.mi, x, y, ns=4)
+    nr.seed(4)
+    outputs_parallel = ee.shuffle_test(ee.mi, x, y, ns=4, multiprocess=1)
+    assert outputs_parallel == outputs_serial
+
+
+def test_shuffle_measure_ignores_global_state():
+    # A forked worker starts from an arbitrary copy of numpy.random, so each
+    # shuffle must depend only on its own seed.
+    x, y, _z = get_samples()
+    args = (ee.mi, x, y, False, 10, {})
+    nr.seed(1)
+    output_0 = ee._shuffle_measure(args)
+    nr.seed(2)
+    state = nr.get_state()
+    output_1 = ee._shuffle_measure(args)
+    assert output_0 == output_1
+    # The caller's global state is left untouched.
+    assert np.all(nr.get_state()[1] == state[1])
+
+
+def test_entropyd_zero_log_zero():
+    # Zero and one probabilities contribute nothing to the entropy.
+    assert np.allclose(ee.entropyfromprobs([0., 1.]), 0.)
+    assert np.allclose(ee.entropyd([0, 1, 2, 3]*5), 2.)
+    assert np.allclose(ee.midd([0, 1]*4, [0, 1]*4), 1.)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2015-2016 MIT Probabilistic Computing Project
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from cgpm.utils import config as cu
+from cgpm.utils import general as gu
+from cgpm.utils import test as tu
+
+
+CCTYPES, DISTARGS = cu.parse_distargs([
+    'bernoulli',
+    'beta',
+    'categorical(k=4)',
+    'exponential',
+    'geometric',
+    'lognormal',
+    'normal',
+    'normal_trunc(l=-1,h=3)',
+    'poisson',
+    'vonmises',
+])
+
+DISCRETE = ['bernoulli', 'categorical', 'geometric', 'poisson']
+
+
+def gen_table(dtype):
+    return tu.gen_data_table(
+        50, [.4, .6], [[.5, .5], [.2, .3, .5]], CCTYPES, DISTARGS,
+        [.8]*len(CCTYPES), rng=gu.gen_rng(3), dtype=dtype)
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_gen_data_table_dtype(dtype):
+    T64, Zv64, Zc64 = gen_table(np.float64)
+    T, Zv, Zc = gen_table(dtype)
+    assert T.dtype == dtype
+    assert T.shape == (len(CCTYPES), 50)
+    # The partitions do not depend on the dtype of the table.
+    assert Zv == Zv64
+    assert Zc == Zc64
+    # Every cctype casts cleanly, with discrete values preserved exactly.
+    assert np.all(np.isfinite(T))
+    assert np.array_equal(T, T64.astype(dtype))
+    for col, cctype in enumerate(CCTYPES):
+        if cctype in DISCRETE:
+            assert np.array_equal(T[col], np.round(T64[col]))
+    assert set(T[CCTYPES.index('bernoulli')]) <= {0, 1}
+    assert set(T[CCTYPES.index('categorical')]) <= set(range(4))
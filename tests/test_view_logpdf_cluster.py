@@ -20,6 +20,7 @@ import pytest
 
 import numpy as np
 
+from cgpm.mixtures.dim import Dim
 from cgpm.mixtures.view import View
 from cgpm.utils import general as gu
 
@@ -92,3 +93,52 @@ def test_logpdf_bayes():
     logp_evidence = view.logpdf(None, {2:0})
     logp_joint = view.logpdf(None, {1:1, 2:0, view.outputs[0]: 0})
     assert np.allclose(logp_joint - logp_evidence, logp_posterior)
+
+
+def test_gibbs_transition_row_restores_on_error():
+    view = retrieve_view()
+    logpdf_score = view.logpdf_score()
+    def raise_error(rowid, K):
+        raise RuntimeError('Scoring failed.')
+    view._logpdf_row_gibbs = raise_error
+    with pytest.raises(RuntimeError):
+        view._gibbs_transition_row(3)
+    # The row held out for scoring is back in its old cluster of every dim.
+    assert view.Zr(3) == 1
+    for dim in view.dims.values():
+        assert dim.Zr.get(3, dim.Zi.get(3)) == 1
+    assert np.allclose(view.logpdf_score(), logpdf_score)
+
+
+def check_network_matches_fresh(view, col):
+    # Queries through the cached network must agree with a rebuilt one.
+    logpdf_cached = view.logpdf(None, {col: .3}, {1: .1})
+    view.rng.seed(4)
+    simulate_cached = view.simulate(None, [col], {view.outputs[0]: 1}, N=5)
+    view._network = None
+    logpdf_fresh = view.logpdf(None, {col: .3}, {1: .1})
+    view.rng.seed(4)
+    simulate_fresh = view.simulate(None, [col], {view.outputs[0]: 1}, N=5)
+    assert np.allclose(logpdf_cached, logpdf_fresh)
+    assert simulate_cached == simulate_fresh
+
+
+def test_network_rebuilt_after_dim_changes():
+    view = retrieve_view()
+    # Build and cache the network over the original normal dims.
+    logpdf_normal = view.logpdf(None, {2: .3}, {1: .1})
+    view.simulate(None, [2], {view.outputs[0]: 1}, N=5)
+    # Through update_cctype, the queries must use the new vonmises dim.
+    view.update_cctype(2, 'vonmises')
+    assert view.build_network().cgpms[-1] is view.dims[2]
+    assert not np.allclose(view.logpdf(None, {2: .3}, {1: .1}), logpdf_normal)
+    check_network_matches_fresh(view, 2)
+    # Through incorporate_dim, the queries must see the new column.
+    dim = Dim(
+        outputs=[3], inputs=[view.outputs[0]], cctype='normal',
+        rng=view.rng)
+    dim.transition_hyper_grids(view.X[1])
+    view.X[3] = [0.2, 1.1, -.4, 3.2, 2.7]
+    view.incorporate_dim(dim)
+    assert view.build_network().cgpms[-1] is dim
+    check_network_matches_fresh(view, 3)